@@ -1,6 +1,8 @@
 package v1
 
 import (
+	"fmt"
+
 	metav1 "k8s.io/apimachinery/pkg/apis/meta/v1"
 )
 
@@ -20,15 +22,35 @@ type TaskSpec struct {
 	Dependencies []string `json:"dependencies,omitempty"` // Parent tasks that must be completed before this task can run
 
 	// Execution details for each task type
-	Command string            `json:"command,omitempty"` // For Bash tasks
-	Script  string            `json:"script,omitempty"`  // For Python/Go code
-	Image   string            `json:"image,omitempty"`   // Custom container image if needed
-	Env     map[string]string `json:"env,omitempty"`     // Environment variables for the task
+	Command   string            `json:"command,omitempty"`   // For Bash tasks
+	Script    string            `json:"script,omitempty"`    // For Python/Go code
+	ScriptRef string            `json:"scriptRef,omitempty"` // Key into DagSpec.Scripts, used instead of Script
+	Image     string            `json:"image,omitempty"`     // Custom container image if needed
+	Env       map[string]string `json:"env,omitempty"`       // Environment variables for the task
 }
 
 // DagSpec defines the complete specification of a DAG as defined by the user.
 type DagSpec struct {
 	Tasks []TaskSpec `json:"tasks"`
+
+	// Scripts holds script sources shared by several tasks, keyed by the value tasks reference in ScriptRef.
+	Scripts map[string]string `json:"scripts,omitempty"`
+
+	// ExecutionOrder lists task names in a dependency-respecting order, as computed by the SDK.
+	ExecutionOrder []string `json:"executionOrder,omitempty"`
+}
+
+// ResolveScript returns the script for a task, following ScriptRef into Scripts when set.
+// It fails when ScriptRef names a script that is not in Scripts.
+func (s *DagSpec) ResolveScript(task *TaskSpec) (string, error) {
+	if task.ScriptRef == "" {
+		return task.Script, nil
+	}
+	script, ok := s.Scripts[task.ScriptRef]
+	if !ok {
+		return "", fmt.Errorf("task %s references unknown script %q", task.Name, task.ScriptRef)
+	}
+	return script, nil
 }
 
 // TaskState represents the current state of an individual task.
@@ -38,7 +38,10 @@ func (e *Executor) Type() []workflowv1.TaskType {
 
 // Execute creates a Pod to run the task
 func (e *Executor) Execute(ctx context.Context, dag *workflowv1.Dag, task *workflowv1.TaskSpec) error {
-	pod := e.buildPod(dag, task)
+	pod, err := e.buildPod(dag, task)
+	if err != nil {
+		return fmt.Errorf("failed to build pod: %w", err)
+	}
 
 	// Set owner reference (Pod will be deleted when DAG is deleted)
 	if err := controllerutil.SetControllerReference(dag, pod, e.Config.Scheme); err != nil {
@@ -105,10 +108,13 @@ func (e *Executor) Cleanup(ctx context.Context, dag *workflowv1.Dag, task *workf
 }
 
 // buildPod converts TaskSpec to Pod
-func (e *Executor) buildPod(dag *workflowv1.Dag, task *workflowv1.TaskSpec) *corev1.Pod {
+func (e *Executor) buildPod(dag *workflowv1.Dag, task *workflowv1.TaskSpec) (*corev1.Pod, error) {
 	podName := e.getPodName(dag.Name, task.Name)
 
-	image, command, args := e.getContainerSpec(task)
+	image, command, args, err := e.getContainerSpec(dag, task)
+	if err != nil {
+		return nil, err
+	}
 
 	return &corev1.Pod{
 		ObjectMeta: metav1.ObjectMeta{
@@ -133,15 +139,20 @@ func (e *Executor) buildPod(dag *workflowv1.Dag, task *workflowv1.TaskSpec) *cor
 				},
 			},
 		},
-	}
+	}, nil
 }
 
 // getContainerSpec returns image, command, and args based on task type
-func (e *Executor) getContainerSpec(task *workflowv1.TaskSpec) (string, []string, []string) {
+func (e *Executor) getContainerSpec(dag *workflowv1.Dag, task *workflowv1.TaskSpec) (string, []string, []string, error) {
 	var image string
 	var command []string
 	var args []string
 
+	script, err := dag.Spec.ResolveScript(task)
+	if err != nil {
+		return "", nil, nil, err
+	}
+
 	// Use custom image if specified
 	if task.Image != "" {
 		image = task.Image
@@ -160,18 +171,18 @@ func (e *Executor) getContainerSpec(task *workflowv1.TaskSpec) (string, []string
 			image = "python:3.9-slim"
 		}
 		command = []string{"python", "-c"}
-		args = []string{task.Script}
+		args = []string{script}
 
 	case workflowv1.TaskTypeGo:
 		if image == "" {
 			image = "golang:1.20-alpine"
 		}
 		command = []string{"/bin/sh", "-c"}
-		goCmd := fmt.Sprintf("echo '%s' > main.go && go mod init dag && go mod tidy && go run main.go", task.Script)
+		goCmd := fmt.Sprintf("echo '%s' > main.go && go mod init dag && go mod tidy && go run main.go", script)
 		args = []string{goCmd}
 	}
 
-	return image, command, args
+	return image, command, args, nil
 }
 
 // buildEnv converts map to EnvVar slice
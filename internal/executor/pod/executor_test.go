@@ -88,7 +88,10 @@ func TestExecutor_BuildPod_Bash(t *testing.T) {
 		Command: "echo hello",
 	}
 
-	pod := exec.buildPod(dag, task)
+	pod, err := exec.buildPod(dag, task)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
 
 	// Verify pod name
 	expectedName := "test-dag-test-task"
@@ -134,7 +137,10 @@ func TestExecutor_BuildPod_Python(t *testing.T) {
 		Script: "print('hello')",
 	}
 
-	pod := exec.buildPod(dag, task)
+	pod, err := exec.buildPod(dag, task)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
 
 	// Verify image
 	if pod.Spec.Containers[0].Image != "python:3.9-slim" {
@@ -147,6 +153,81 @@ func TestExecutor_BuildPod_Python(t *testing.T) {
 	}
 }
 
+func TestExecutor_BuildPod_PythonScriptRef(t *testing.T) {
+	scheme := newTestScheme()
+	client := fake.NewClientBuilder().WithScheme(scheme).Build()
+
+	exec := New(executor.ExecutorConfig{
+		Client: client,
+		Scheme: scheme,
+	})
+
+	dag := &workflowv1.Dag{
+		ObjectMeta: metav1.ObjectMeta{
+			Name:      "test-dag",
+			Namespace: "default",
+		},
+		Spec: workflowv1.DagSpec{
+			Scripts: map[string]string{
+				"abc123": "print('shared')",
+			},
+		},
+	}
+
+	task := &workflowv1.TaskSpec{
+		Name:      "python-task",
+		Type:      workflowv1.TaskTypePython,
+		ScriptRef: "abc123",
+	}
+
+	pod, err := exec.buildPod(dag, task)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+
+	// Verify script is resolved from the shared scripts map
+	if pod.Spec.Containers[0].Args[0] != "print('shared')" {
+		t.Errorf("expected shared script in args, got %v", pod.Spec.Containers[0].Args)
+	}
+}
+
+func TestExecutor_BuildPod_MissingScriptRef(t *testing.T) {
+	scheme := newTestScheme()
+	client := fake.NewClientBuilder().WithScheme(scheme).Build()
+
+	exec := New(executor.ExecutorConfig{
+		Client: client,
+		Scheme: scheme,
+	})
+
+	dag := &workflowv1.Dag{
+		ObjectMeta: metav1.ObjectMeta{
+			Name:      "test-dag",
+			Namespace: "default",
+		},
+		Spec: workflowv1.DagSpec{
+			Scripts: map[string]string{
+				"abc123": "print('shared')",
+			},
+		},
+	}
+
+	task := &workflowv1.TaskSpec{
+		Name:      "python-task",
+		Type:      workflowv1.TaskTypePython,
+		ScriptRef: "missing",
+	}
+
+	if _, err := exec.buildPod(dag, task); err == nil {
+		t.Error("expected error for unknown script ref")
+	}
+
+	// Execute must fail too instead of creating a Pod with an empty script
+	if err := exec.Execute(context.Background(), dag, task); err == nil {
+		t.Error("expected Execute to fail for unknown script ref")
+	}
+}
+
 func TestExecutor_BuildPod_Go(t *testing.T) {
 	scheme := newTestScheme()
 	client := fake.NewClientBuilder().WithScheme(scheme).Build()
@@ -169,7 +250,10 @@ func TestExecutor_BuildPod_Go(t *testing.T) {
 		Script: "package main\nfunc main() {}",
 	}
 
-	pod := exec.buildPod(dag, task)
+	pod, err := exec.buildPod(dag, task)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
 
 	// Verify image
 	if pod.Spec.Containers[0].Image != "golang:1.20-alpine" {
@@ -202,7 +286,10 @@ func TestExecutor_BuildPod_WithEnv(t *testing.T) {
 		},
 	}
 
-	pod := exec.buildPod(dag, task)
+	pod, err := exec.buildPod(dag, task)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
 
 	// Verify env var is set
 	found := false
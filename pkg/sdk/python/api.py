@@ -1,16 +1,18 @@
 """
 Nautikus Python SDK - Minimal API layer
 """
+import json
 import os
+from collections import deque
 from typing import Callable, List, Dict, Optional
 from dataclasses import dataclass, field
 
-from .processing.types import TaskDef, TaskType
-from .processing.executor import execute_task
-from .processing.generator import generate_manifest
+from .processing.types import DATACLASS_SLOTS, TaskDef, TaskType
+from .processing.executor import execute_task, report_task_failure
+from .processing.generator import find_caller_file, generate_manifest
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Task:
     """Represents a unit of work in a DAG"""
     name: str
@@ -24,10 +26,28 @@ class DAGBuilder:
     def __init__(self, name: str):
         self.name = name
         self.tasks: List[TaskDef] = []
+        self._by_name: Dict[str, TaskDef] = {}
+        # Names of tasks folded into a fused task -> name of the fused task
+        self._aliases: Dict[str, str] = {}
+        self._topo_order: List[str] = []
+        # Condition task name -> branch fixed at build time, recorded in the manifest
+        self._static_branches: Dict[str, str] = {}
+        # Inside a Pod, the decisions taken when the manifest was generated
+        self._manifest_static_branches: Dict[str, str] = json.loads(
+            os.environ.get("NAUTIKUS_STATIC_BRANCHES", "{}"))
+        # Resolved here, while the user's dag file is the immediate caller
+        self._source_file = find_caller_file()
 
-    def add_task(self, name: str, fn: Callable, deps: List[str] = None) -> 'DAGBuilder':
+    def _add(self, task: TaskDef):
+        """Register a task, keeping the name index in sync with the task list"""
+        if task.name in self._by_name or task.name in self._aliases:
+            raise ValueError(f"duplicate task name: {task.name}")
+        self.tasks.append(task)
+        self._by_name[task.name] = task
+
+    def add_task(self, name: str, fn: Callable, deps: Optional[List[str]] = None) -> 'DAGBuilder':
         """Add a simple task with optional dependencies"""
-        self.tasks.append(TaskDef(
+        self._add(TaskDef(
             name=name,
             fn=fn,
             dependencies=deps or [],
@@ -39,10 +59,10 @@ class DAGBuilder:
         """Add tasks that run sequentially (each depends on previous)"""
         prev_name = None
         for t in tasks:
-            deps = list(t.dependencies)
+            deps = t.dependencies
             if prev_name:
-                deps.insert(0, prev_name)
-            self.tasks.append(TaskDef(
+                deps = [prev_name, *deps]
+            self._add(TaskDef(
                 name=t.name,
                 fn=t.fn,
                 dependencies=deps,
@@ -51,13 +71,56 @@ class DAGBuilder:
             prev_name = t.name
         return self
 
+    def add_sequential_fused(self, *tasks: Task, name: Optional[str] = None) -> 'DAGBuilder':
+        """
+        Add sequential tasks that run one after another inside a single Pod
+
+        Saves a Pod start per task for chains with no fan-in or fan-out in
+        between. Other tasks may keep depending on any of the fused task names.
+
+        Args:
+            tasks: Tasks to run in order
+            name: Name of the fused task (defaults to the task names joined by '-')
+        """
+        if not tasks:
+            raise ValueError("add_sequential_fused needs at least one task")
+        fused_name = name or "-".join(t.name for t in tasks)
+        member_names = set()
+        for t in tasks:
+            if t.name in self._by_name or t.name in self._aliases or t.name in member_names:
+                raise ValueError(f"duplicate task name: {t.name}")
+            member_names.add(t.name)
+        fns = [t.fn for t in tasks]
+
+        def fused():
+            for fn in fns:
+                fn()
+
+        # External dependencies of every member, in order of first appearance
+        deps: List[str] = []
+        for t in tasks:
+            for dep in t.dependencies:
+                if dep not in member_names and dep not in deps:
+                    deps.append(dep)
+
+        self._add(TaskDef(
+            name=fused_name,
+            fn=fused,
+            dependencies=deps,
+            task_type=TaskType.SIMPLE
+        ))
+        for t in tasks:
+            if t.name != fused_name:
+                self._aliases[t.name] = fused_name
+        return self
+
     def add_parallel(self, after_task: str, *tasks: Task) -> 'DAGBuilder':
         """Add tasks that run in parallel (same dependencies)"""
         for t in tasks:
-            deps = list(t.dependencies)
+            deps = t.dependencies
             if after_task:
-                deps.insert(0, after_task)
-            self.tasks.append(TaskDef(
+                deps = [after_task, *deps]
+            self._add(TaskDef(
                 name=t.name,
                 fn=t.fn,
                 dependencies=deps,
@@ -66,7 +129,8 @@ class DAGBuilder:
         return self
 
     def add_branch(self, condition_task_name: str, condition_fn: Callable[[], str],
-                   branches: Dict[str, List[Task]]) -> 'DAGBuilder':
+                   branches: Dict[str, List[Task]],
+                   static_branch: Optional[str] = None) -> 'DAGBuilder':
         """
         Add conditional branching (like Airflow's BranchPythonOperator)
 
@@ -74,26 +138,41 @@ class DAGBuilder:
             condition_task_name: Name of the condition evaluation task
             condition_fn: Function that returns the branch name to execute
             branches: Dict mapping branch names to list of tasks
+            static_branch: Branch known to be selected at build time; the other
+                branches are pruned from the DAG by optimize()
         """
-        # Add the condition task
-        self.tasks.append(TaskDef(
-            name=condition_task_name,
-            branch_fn=condition_fn,
-            task_type=TaskType.BRANCH,
-            branch_targets=list(branches.keys())
-        ))
+        # Pods replay the decision from the manifest, whatever the DAG file computes now
+        static_branch = self._manifest_static_branches.get(condition_task_name, static_branch)
+        if static_branch is None:
+            # Add the condition task
+            self._add(TaskDef(
+                name=condition_task_name,
+                branch_fn=condition_fn,
+                task_type=TaskType.BRANCH,
+                branch_targets=list(branches.keys())
+            ))
+        elif static_branch in branches:
+            # Condition is already decided, keep only a placeholder for dependencies
+            self._add(TaskDef(
+                name=condition_task_name,
+                task_type=TaskType.SIMPLE,
+                branch_targets=[static_branch]
+            ))
+            self._static_branches[condition_task_name] = static_branch
+        else:
+            raise ValueError(f"unknown static branch {static_branch} for {condition_task_name}")
 
         # Add all branch tasks with skip conditions
         for branch_name, branch_tasks in branches.items():
             prev_name = None
             for i, t in enumerate(branch_tasks):
-                deps = list(t.dependencies)
+                deps = t.dependencies
                 if i == 0:
-                    deps.insert(0, condition_task_name)
+                    deps = [condition_task_name, *deps]
                 elif prev_name:
-                    deps.insert(0, prev_name)
+                    deps = [prev_name, *deps]
 
-                self.tasks.append(TaskDef(
+                self._add(TaskDef(
                     name=t.name,
                     fn=t.fn,
                     dependencies=deps,
@@ -106,7 +185,7 @@ class DAGBuilder:
 
     def add_join(self, name: str, fn: Callable, wait_for: List[str]) -> 'DAGBuilder':
         """Add a join task that waits for any of the specified tasks"""
-        self.tasks.append(TaskDef(
+        self._add(TaskDef(
             name=name,
             fn=fn,
             dependencies=wait_for,
@@ -114,13 +193,116 @@ class DAGBuilder:
         ))
         return self
 
+    def optimize(self) -> 'DAGBuilder':
+        """Drop tasks whose branch can never be selected"""
+        pruned = set()
+        for t in self.tasks:
+            if not t.branch_condition:
+                continue
+            source = self._by_name.get(t.condition_source) if t.condition_source else None
+            if source is None or t.branch_condition not in source.branch_targets:
+                pruned.add(t.name)
+            elif source.task_type is not TaskType.BRANCH:
+                # Branch was resolved at build time, so the task always runs
+                t.branch_condition = None
+                t.condition_source = None
+
+        if not pruned:
+            return self
+
+        # Dependents of a pruned task inherit its dependencies, so they keep their place
+        inherited: Dict[str, List[str]] = {}
+
+        def upstream(name: str) -> List[str]:
+            if name not in inherited:
+                inherited[name] = []  # Stops cycles among pruned tasks
+                deps: List[str] = []
+                for dep in self._by_name[name].dependencies:
+                    deps.extend(upstream(dep) if dep in pruned else [dep])
+                inherited[name] = deps
+            return inherited[name]
+
+        for t in self.tasks:
+            if t.name not in pruned and any(dep in pruned for dep in t.dependencies):
+                deps = []
+                for dep in t.dependencies:
+                    deps.extend(upstream(dep) if dep in pruned else [dep])
+                t.dependencies = list(dict.fromkeys(deps))
+
+        self.tasks = [t for t in self.tasks if t.name not in pruned]
+        for name in pruned:
+            del self._by_name[name]
+        return self
+
+    def build(self) -> 'DAGBuilder':
+        """Validate and freeze task dependency lists once all tasks have been added"""
+        for t in self.tasks:
+            deps = tuple(dict.fromkeys(self._aliases.get(dep, dep) for dep in t.dependencies))
+            for dep in deps:
+                if dep not in self._by_name:
+                    raise ValueError(f"task {t.name} depends on unknown task {dep}")
+            t.dependencies = deps
+            t.branch_targets = tuple(t.branch_targets)
+        self._topo_order = self._topological_order()
+        return self
+
+    def _topological_order(self) -> List[str]:
+        """Order task names so every task follows its dependencies (Kahn's algorithm)"""
+        indegree = {t.name: len(t.dependencies) for t in self.tasks}
+        dependents: Dict[str, List[str]] = {t.name: [] for t in self.tasks}
+        for t in self.tasks:
+            for dep in t.dependencies:
+                dependents[dep].append(t.name)
+
+        ready = deque(name for name, count in indegree.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+
+        if len(order) != len(self.tasks):
+            raise ValueError(f"dependency cycle between tasks: {', '.join(self._cyclic_tasks(indegree))}")
+        return order
+
+    def _cyclic_tasks(self, indegree: Dict[str, int]) -> List[str]:
+        """Narrow the tasks Kahn's algorithm could not order down to the cycles"""
+        # Left-over tasks sit on a cycle or downstream of one; peel off those
+        # that no other left-over task depends on until only cycles remain
+        stuck = {name for name, count in indegree.items() if count > 0}
+        dependents = {name: 0 for name in stuck}
+        for name in stuck:
+            for dep in self._by_name[name].dependencies:
+                if dep in stuck:
+                    dependents[dep] += 1
+
+        leaves = deque(name for name, count in dependents.items() if count == 0)
+        while leaves:
+            name = leaves.popleft()
+            stuck.discard(name)
+            for dep in self._by_name[name].dependencies:
+                if dep in stuck:
+                    dependents[dep] -= 1
+                    if dependents[dep] == 0:
+                        leaves.append(dep)
+        return [t.name for t in self.tasks if t.name in stuck]
+
     def serve(self):
         """Execute the DAG (either generates manifest or runs task based on env)"""
+        self.optimize().build()
         target_task = os.environ.get("NAUTIKUS_TASK_NAME")
         if target_task:
-            execute_task(target_task, self.tasks)
+            with report_task_failure():
+                execute_task(target_task, self._by_name)
             return
-        generate_manifest(self.name, self.tasks)
+        common_env = {}
+        if self._static_branches:
+            common_env["NAUTIKUS_STATIC_BRANCHES"] = json.dumps(self._static_branches)
+        generate_manifest(self.name, self.tasks, self._source_file, self._topo_order,
+                          common_env=common_env)
 
 
 def serve(dag_name: str, tasks: List[Callable]):
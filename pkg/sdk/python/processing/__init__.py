@@ -1,6 +1,6 @@
 """Processing layer for Nautikus Python SDK"""
 from .types import TaskDef, TaskType
-from .executor import execute_task
-from .generator import generate_manifest
+from .executor import execute_task, report_task_failure
+from .generator import find_caller_file, generate_manifest
 
-__all__ = ['TaskDef', 'TaskType', 'execute_task', 'generate_manifest']
+__all__ = ['TaskDef', 'TaskType', 'execute_task', 'report_task_failure', 'find_caller_file', 'generate_manifest']
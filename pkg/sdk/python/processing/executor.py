@@ -1,41 +1,88 @@
 """Task execution logic"""
 import os
 import sys
-from typing import List
+from types import TracebackType
+from typing import Dict, List, Optional, Type
 
 from .types import TaskDef, TaskType
 
 
-def execute_task(target_task: str, tasks: List[TaskDef]):
+def execute_task(target_task: str, tasks: Dict[str, TaskDef]) -> None:
     """Execute a specific task by name (called inside Pod)"""
-    for task in tasks:
-        if task.name == target_task:
-            print(f"🚀 Starting task: {target_task}")
-
-            # Handle branch condition check
-            if task.branch_condition:
-                selected_branch = os.environ.get("NAUTIKUS_SELECTED_BRANCH", "")
-                if selected_branch and selected_branch != task.branch_condition:
-                    print(f"⏭️  Skipping task {target_task} "
-                          f"(branch {task.branch_condition} not selected, selected: {selected_branch})")
-                    return
-
-            # Handle branch selector task
-            if task.task_type == TaskType.BRANCH and task.branch_fn:
-                selected_branch = task.branch_fn()
-                print(f"🔀 Branch selected: {selected_branch}")
-                # Output branch selection for downstream tasks
-                print(f"NAUTIKUS_BRANCH_RESULT={selected_branch}")
-                return
-
-            # Execute normal task
-            if task.fn:
-                try:
-                    task.fn()
-                except Exception as e:
-                    print(f"❌ Task failed: {e}")
-                    sys.exit(1)
+    task = tasks.get(target_task)
+    if task is None:
+        print(f"❌ Unknown task: {target_task}", file=sys.stderr)
+        sys.exit(1)
+
+    # Lines are buffered and written once before user code runs or on return
+    lines = [f"🚀 Starting task: {target_task}"]
+
+    # Handle branch condition check
+    if task.branch_condition:
+        selected_branch = os.environ.get("NAUTIKUS_SELECTED_BRANCH", "")
+        if selected_branch and selected_branch != task.branch_condition:
+            lines.append(f"⏭️  Skipping task {target_task} "
+                         f"(branch {task.branch_condition} not selected, selected: {selected_branch})")
+            _write_lines(lines)
             return
 
-    print(f"❌ Unknown task: {target_task}", file=sys.stderr)
-    sys.exit(1)
+    _write_lines(lines)
+
+    # Handle branch selector task
+    if task.task_type is TaskType.BRANCH and task.branch_fn:
+        selected_branch = task.branch_fn()
+        _write_lines([
+            f"🔀 Branch selected: {selected_branch}",
+            # Output branch selection for downstream tasks
+            f"NAUTIKUS_BRANCH_RESULT={selected_branch}",
+        ])
+        return
+
+    # Execute normal task
+    if task.fn:
+        task.fn()
+
+
+def _write_lines(lines: List[str]) -> None:
+    """Write several log lines to stdout with a single write and flush"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+class _FailureHook:
+    """Excepthook that prints the failure banner for the task's own error"""
+
+    def __init__(self) -> None:
+        self.previous = sys.excepthook
+        self.failed: Optional[BaseException] = None
+
+    def __enter__(self) -> None:
+        sys.excepthook = self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> None:
+        if exc is None:
+            sys.excepthook = self.previous
+        else:
+            # Leave the hook installed; the interpreter reports this exception next
+            self.failed = exc
+
+    def __call__(self, exc_type: Type[BaseException], exc: BaseException,
+                 tb: Optional[TracebackType]) -> None:
+        if exc is self.failed:
+            print(f"❌ Task failed: {exc}", flush=True)
+        self.previous(exc_type, exc, tb)
+        # Restore last: sys.excepthook may hold the only reference to this hook
+        sys.excepthook = self.previous
+
+
+def report_task_failure() -> _FailureHook:
+    """
+    Report a task error that escapes to the interpreter (used by the Pod entrypoint)
+
+    Task errors are not caught: they propagate, the interpreter prints the
+    traceback and exits with 1. An excepthook adds the failure banner in front
+    of that traceback. It is removed again when the task succeeds, and it puts
+    the previous hook back the first time it runs.
+    """
+    return _FailureHook()
@@ -1,77 +1,120 @@
 """DAG manifest generation logic"""
+import functools
+import hashlib
 import json
+import os
 import sys
-import inspect
-from typing import List
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
-from .types import TaskDef, TaskType
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None  # type: ignore[assignment]
 
+from .types import TaskDef
+
+# Root of the Python SDK package; frames from files below it are SDK code
+_SDK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+# Only the name and spec contents vary between DAGs, the rest is encoded once.
+# Tasks are streamed one by one between the head and the tail.
+_MANIFEST_HEAD = (
+    b'{"apiVersion":"workflow.nautikus.io/v1","kind":"Dag",'
+    b'"metadata":{"name":%s},'
+    b'"spec":{"tasks":['
+)
+_MANIFEST_TAIL = b'],"scripts":%s,"executionOrder":%s}}\n'
 
-def generate_manifest(dag_name: str, tasks: List[TaskDef]):
-    """Create the DAG JSON manifest from task definitions"""
-    script_content = _read_caller_source()
 
-    task_specs = []
+def generate_manifest(dag_name: str, tasks: List[TaskDef], source_file: Optional[str],
+                      execution_order: Sequence[str] = (),
+                      common_env: Optional[Dict[str, str]] = None) -> None:
+    """Create the DAG JSON manifest from task definitions"""
+    script_content = _read_source(source_file)
+    # Embed the source once and let every task reference it by key
+    script_id = hashlib.blake2b(script_content.encode(), digest_size=8).hexdigest()
 
+    write = _stdout_writer()
+    write(_MANIFEST_HEAD % _dumps(dag_name))
+    separator = b""
     for task in tasks:
-        spec = {
-            "name": task.name,
-            "type": "Python",
-            "script": script_content,
-            "dependencies": task.dependencies,
-            "env": {
-                "NAUTIKUS_TASK_NAME": task.name
-            }
-        }
-
-        # Add branch metadata for conditional tasks
-        if task.branch_condition:
-            spec["env"]["NAUTIKUS_BRANCH_CONDITION"] = task.branch_condition
-            spec["env"]["NAUTIKUS_CONDITION_SOURCE"] = task.condition_source
-
-        # Mark branch selector tasks
-        if task.task_type == TaskType.BRANCH:
-            spec["env"]["NAUTIKUS_TASK_TYPE"] = "branch"
-            if task.branch_targets:
-                spec["env"]["NAUTIKUS_BRANCH_TARGETS"] = ",".join(task.branch_targets)
-
-        # Mark join tasks
-        if task.task_type == TaskType.JOIN:
-            spec["env"]["NAUTIKUS_TASK_TYPE"] = "join"
-
-        task_specs.append(spec)
-
-    manifest = {
-        "apiVersion": "workflow.nautikus.io/v1",
-        "kind": "Dag",
-        "metadata": {
-            "name": dag_name
-        },
-        "spec": {
-            "tasks": task_specs
-        }
+        write(separator)
+        write(_dumps(_task_spec(task, script_id, common_env)))
+        separator = b","
+    write(_MANIFEST_TAIL % (
+        _dumps({script_id: script_content}),
+        _dumps(list(execution_order)),
+    ))
+    sys.stdout.flush()
+
+
+def _stdout_writer() -> Callable[[bytes], object]:
+    """Bytes writer for stdout, decoding when stdout is text-only (e.g. StringIO)"""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is not None:
+        # Keep anything already printed ahead of the manifest
+        sys.stdout.flush()
+        write: Callable[[bytes], object] = buffer.write
+        return write
+    return lambda data: sys.stdout.write(data.decode())
+
+
+def _task_spec(task: TaskDef, script_id: str,
+               common_env: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Manifest entry for a single task"""
+    env = task.build_env()
+    if common_env:
+        env.update(common_env)
+    return {
+        "name": task.name,
+        "type": "Python",
+        "scriptRef": script_id,
+        "dependencies": task.dependencies,
+        "env": env
     }
 
-    print(json.dumps(manifest, indent=2))
 
+def _dumps(value: Any) -> bytes:
+    """Encode a value as compact JSON"""
+    if orjson is not None:
+        encoded: bytes = orjson.dumps(value)
+        return encoded
+    return json.dumps(value, separators=(",", ":")).encode()
 
-def _read_caller_source() -> str:
-    """Read the source file that called the SDK"""
-    # Walk up the stack to find the user's dag file (not SDK files)
-    for frame_info in inspect.stack():
-        caller_file = frame_info.filename
-        # Skip SDK files and built-in locations
-        if not _is_sdk_file(caller_file) and not caller_file.startswith('<'):
-            try:
-                with open(caller_file, 'r') as f:
-                    return f.read()
-            except Exception:
-                continue
+
+def _read_source(source_file: Optional[str]) -> str:
+    """Read the user's dag file"""
+    if source_file is not None:
+        try:
+            return _read_file(source_file)
+        except OSError:
+            pass
 
     sys.stderr.write("Error: could not read source file\n")
     sys.exit(1)
 
 
+def find_caller_file() -> Optional[str]:
+    """Walk up the stack to find the user's dag file (not SDK files)"""
+    frame: Optional[FrameType] = sys._getframe(1)
+    while frame is not None:
+        caller_file = frame.f_code.co_filename
+        # Skip SDK files and built-in locations
+        if not caller_file.startswith('<') and not _is_sdk_file(caller_file):
+            return caller_file
+        frame = frame.f_back
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _read_file(path: str) -> str:
+    """Read a source file once per process"""
+    with open(path, 'r') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=256)
 def _is_sdk_file(path: str) -> bool:
     """Check if path is part of the SDK"""
-    return '/sdk/python/' in path or '/sdk/go/' in path
+    return os.path.abspath(path).startswith(_SDK_DIR)
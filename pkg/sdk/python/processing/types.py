@@ -1,7 +1,11 @@
 """Type definitions for the processing layer"""
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Callable, List, Optional
+from typing import Callable, Dict, Optional, Sequence
+
+# Slotted dataclasses need Python 3.10+; Pods may still run the SDK on 3.9
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class TaskType(Enum):
@@ -11,14 +15,33 @@ class TaskType(Enum):
     JOIN = "join"       # Waits for any upstream branch
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TaskDef:
     """Internal representation of a task for processing"""
     name: str
-    fn: Optional[Callable] = None
+    fn: Optional[Callable[[], None]] = None
     branch_fn: Optional[Callable[[], str]] = None  # For branch tasks
-    dependencies: List[str] = field(default_factory=list)
+    dependencies: Sequence[str] = field(default_factory=list)
     task_type: TaskType = TaskType.SIMPLE
-    branch_targets: List[str] = field(default_factory=list)  # For branch tasks
+    branch_targets: Sequence[str] = field(default_factory=list)  # For branch tasks
     branch_condition: Optional[str] = None  # For conditional tasks: which branch this belongs to
     condition_source: Optional[str] = None  # For conditional tasks: which branch task determines execution
+
+    def build_env(self) -> Dict[str, str]:
+        """Environment variables the Pod running this task needs"""
+        env = {"NAUTIKUS_TASK_NAME": self.name}
+
+        # Add branch metadata for conditional tasks
+        if self.branch_condition:
+            env["NAUTIKUS_BRANCH_CONDITION"] = self.branch_condition
+            env["NAUTIKUS_CONDITION_SOURCE"] = self.condition_source or ""
+
+        # Mark branch selector and join tasks
+        if self.task_type is TaskType.BRANCH:
+            env["NAUTIKUS_TASK_TYPE"] = "branch"
+            if self.branch_targets:
+                env["NAUTIKUS_BRANCH_TARGETS"] = ",".join(self.branch_targets)
+        elif self.task_type is TaskType.JOIN:
+            env["NAUTIKUS_TASK_TYPE"] = "join"
+
+        return env
@@ -0,0 +1,311 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+# Add project root to sys.path to find the SDK
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../'))
+sys.path.append(ROOT)
+
+from pkg.sdk.python import DAGBuilder, Task, serve
+
+with open(__file__) as f:
+    THIS_SOURCE = f.read()
+
+
+def noop():
+    pass
+
+
+def render_manifest(dag: DAGBuilder) -> dict:
+    """Run serve() in manifest mode and parse what it prints"""
+    out = io.StringIO()
+    with mock.patch.dict(os.environ), contextlib.redirect_stdout(out):
+        os.environ.pop("NAUTIKUS_TASK_NAME", None)
+        dag.serve()
+    return json.loads(out.getvalue())
+
+
+def run_task(dag: DAGBuilder, name: str, **env: str) -> str:
+    """Run serve() in task mode, as the Pod does, and return what it prints"""
+    out = io.StringIO()
+    with mock.patch.dict(os.environ, NAUTIKUS_TASK_NAME=name, **env), \
+            contextlib.redirect_stdout(out):
+        dag.serve()
+    return out.getvalue()
+
+
+def embedded_source(manifest: dict) -> str:
+    """Script referenced by the manifest's first task"""
+    return manifest["spec"]["scripts"][manifest["spec"]["tasks"][0]["scriptRef"]]
+
+
+def task_deps(manifest: dict) -> dict:
+    return {t["name"]: t["dependencies"] for t in manifest["spec"]["tasks"]}
+
+
+class ManifestOutputTest(unittest.TestCase):
+
+    def test_text_only_stdout(self):
+        manifest = render_manifest(DAGBuilder("text-stdout").add_task("a", noop))
+        self.assertEqual(task_deps(manifest), {"a": []})
+        self.assertEqual(embedded_source(manifest), THIS_SOURCE)
+
+    def test_embeds_dag_file_source(self):
+        dag = DAGBuilder("source").add_task("a", noop).add_task("b", noop, ["a"])
+        manifest = render_manifest(dag)
+        self.assertEqual(embedded_source(manifest), THIS_SOURCE)
+        # Every task shares the single embedded copy
+        self.assertEqual({t["scriptRef"] for t in manifest["spec"]["tasks"]},
+                         set(manifest["spec"]["scripts"]))
+
+    def test_legacy_serve_embeds_caller_source(self):
+        out = io.StringIO()
+        with mock.patch.dict(os.environ), contextlib.redirect_stdout(out):
+            os.environ.pop("NAUTIKUS_TASK_NAME", None)
+            serve("legacy", [noop])
+        self.assertEqual(embedded_source(json.loads(out.getvalue())), THIS_SOURCE)
+
+
+class StaticBranchTest(unittest.TestCase):
+
+    def build_dag(self, static_branch=None, condition_fn=lambda: "hi"):
+        return (DAGBuilder("static")
+                .add_task("start", noop)
+                .add_branch("chk", condition_fn, {
+                    "hi": [Task(name="p_hi", fn=noop)],
+                    "lo": [Task(name="p_lo", fn=noop), Task(name="clean", fn=noop)],
+                }, static_branch=static_branch)
+                .add_join("load", noop, ["p_hi", "clean"]))
+
+    def test_dynamic_branch_keeps_all_tasks(self):
+        deps = task_deps(render_manifest(self.build_dag()))
+        self.assertEqual(set(deps), {"start", "chk", "p_hi", "p_lo", "clean", "load"})
+
+    def test_unselected_branch_is_pruned(self):
+        manifest = render_manifest(self.build_dag(static_branch="hi"))
+        deps = task_deps(manifest)
+        self.assertEqual(set(deps), {"start", "chk", "p_hi", "load"})
+        self.assertEqual(deps["p_hi"], ["chk"])
+        # The pruned "clean" is replaced by its surviving upstream task
+        self.assertEqual(deps["load"], ["p_hi", "chk"])
+
+        env = {t["name"]: t["env"] for t in manifest["spec"]["tasks"]}
+        self.assertNotIn("NAUTIKUS_BRANCH_CONDITION", env["p_hi"])
+        self.assertNotIn("NAUTIKUS_TASK_TYPE", env["chk"])
+
+    def test_dependents_of_pruned_tasks_keep_their_ordering(self):
+        dag = (self.build_dag(static_branch="hi")
+               .add_task("after_low", noop, ["clean"]))
+        deps = task_deps(render_manifest(dag))
+        self.assertNotIn("clean", deps)
+        self.assertEqual(deps["after_low"], ["chk"])
+
+    def test_unknown_static_branch(self):
+        with self.assertRaises(ValueError):
+            self.build_dag(static_branch="missing")
+
+    def test_pod_replays_static_decision_from_manifest(self):
+        manifest = render_manifest(self.build_dag(static_branch="hi"))
+        chk_env = next(t["env"] for t in manifest["spec"]["tasks"] if t["name"] == "chk")
+
+        condition_fn = mock.Mock(return_value="lo")
+        out = io.StringIO()
+        with mock.patch.dict(os.environ, chk_env), contextlib.redirect_stdout(out):
+            # The Pod re-runs the DAG file without the build-time value
+            self.build_dag(static_branch=None, condition_fn=condition_fn).serve()
+
+        condition_fn.assert_not_called()
+        self.assertNotIn("NAUTIKUS_BRANCH_RESULT", out.getvalue())
+
+
+class FusedSequenceTest(unittest.TestCase):
+
+    def test_fused_chain_is_one_task(self):
+        dag = (DAGBuilder("fused")
+               .add_task("start", noop)
+               .add_sequential_fused(
+                   Task(name="extract", fn=noop, dependencies=["start"]),
+                   Task(name="validate", fn=noop, dependencies=["start", "extract"]),
+               ))
+        self.assertEqual(task_deps(render_manifest(dag)), {
+            "start": [],
+            "extract-validate": ["start"],
+        })
+
+    def test_member_names_resolve_to_fused_task(self):
+        dag = (DAGBuilder("fused")
+               .add_sequential_fused(Task(name="a", fn=noop), Task(name="b", fn=noop), name="ab")
+               .add_task("c", noop, ["a", "b"]))
+        self.assertEqual(task_deps(render_manifest(dag))["c"], ["ab"])
+
+    def test_fused_functions_run_in_order(self):
+        calls = []
+        dag = DAGBuilder("fused").add_sequential_fused(
+            Task(name="a", fn=lambda: calls.append("a")),
+            Task(name="b", fn=lambda: calls.append("b")),
+        )
+        with mock.patch.dict(os.environ, {"NAUTIKUS_TASK_NAME": "a-b"}), \
+                contextlib.redirect_stdout(io.StringIO()):
+            dag.serve()
+        self.assertEqual(calls, ["a", "b"])
+
+    def test_member_clashing_with_existing_task(self):
+        dag = DAGBuilder("fused").add_task("b", noop)
+        with self.assertRaisesRegex(ValueError, "duplicate task name"):
+            dag.add_sequential_fused(Task(name="b", fn=noop), Task(name="c", fn=noop))
+
+    def test_member_clashing_with_fused_member(self):
+        dag = DAGBuilder("fused").add_sequential_fused(Task(name="a", fn=noop), Task(name="b", fn=noop))
+        with self.assertRaisesRegex(ValueError, "duplicate task name"):
+            dag.add_sequential_fused(Task(name="b", fn=noop), Task(name="c", fn=noop))
+        with self.assertRaisesRegex(ValueError, "duplicate task name"):
+            dag.add_task("a", noop)
+
+    def test_empty_chain_is_rejected(self):
+        dag = DAGBuilder("fused")
+        with self.assertRaises(ValueError):
+            dag.add_sequential_fused()
+        self.assertEqual(dag.tasks, [])
+
+    def test_repeated_member(self):
+        with self.assertRaisesRegex(ValueError, "duplicate task name"):
+            DAGBuilder("fused").add_sequential_fused(Task(name="a", fn=noop), Task(name="a", fn=noop))
+
+
+class BuildValidationTest(unittest.TestCase):
+
+    def test_execution_order_follows_dependencies(self):
+        dag = (DAGBuilder("order")
+               .add_task("d", noop, ["b", "c"])
+               .add_task("c", noop, ["a"])
+               .add_task("b", noop, ["a"])
+               .add_task("a", noop))
+        order = render_manifest(dag)["spec"]["executionOrder"]
+        self.assertEqual(sorted(order), ["a", "b", "c", "d"])
+        for name, deps in [("b", ["a"]), ("c", ["a"]), ("d", ["b", "c"])]:
+            for dep in deps:
+                self.assertLess(order.index(dep), order.index(name))
+
+    def test_cycle_is_rejected(self):
+        dag = (DAGBuilder("cycle")
+               .add_task("a", noop, ["c"])
+               .add_task("b", noop, ["a"])
+               .add_task("c", noop, ["b"])
+               .add_task("free", noop))
+        with self.assertRaisesRegex(ValueError, "dependency cycle between tasks: a, b, c"):
+            dag.build()
+
+    def test_cycle_error_names_only_cycle_members(self):
+        dag = (DAGBuilder("cycle")
+               .add_task("a", noop, ["b"])
+               .add_task("b", noop, ["a"])
+               .add_task("c", noop, ["a"])
+               .add_task("d", noop, ["c"]))
+        with self.assertRaises(ValueError) as ctx:
+            dag.build()
+        self.assertEqual(str(ctx.exception), "dependency cycle between tasks: a, b")
+
+    def test_unknown_dependency_is_rejected(self):
+        dag = DAGBuilder("unknown").add_task("a", noop, ["missing"])
+        with self.assertRaisesRegex(ValueError, "task a depends on unknown task missing"):
+            dag.build()
+
+    def test_duplicate_task_name_is_rejected(self):
+        dag = DAGBuilder("dup").add_task("a", noop)
+        with self.assertRaisesRegex(ValueError, "duplicate task name: a"):
+            dag.add_task("a", noop)
+
+    def test_forward_references_are_allowed(self):
+        dag = DAGBuilder("forward").add_task("b", noop, ["a"]).add_task("a", noop)
+        self.assertEqual(render_manifest(dag)["spec"]["executionOrder"], ["a", "b"])
+
+    def test_dependencies_are_deduplicated_and_frozen(self):
+        deps = ["a", "a"]
+        dag = DAGBuilder("freeze").add_task("a", noop).add_task("b", noop, deps).build()
+        task = dag.tasks[1]
+        self.assertEqual(task.dependencies, ("a",))
+        self.assertEqual(deps, ["a", "a"])
+
+
+class TaskExecutionTest(unittest.TestCase):
+
+    def test_runs_only_the_named_task(self):
+        calls = []
+        dag = (DAGBuilder("lookup")
+               .add_task("a", lambda: calls.append("a"))
+               .add_task("b", lambda: calls.append("b"), ["a"]))
+        run_task(dag, "b")
+        self.assertEqual(calls, ["b"])
+
+    def test_unknown_task_exits_with_1(self):
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err), self.assertRaises(SystemExit) as cm:
+            run_task(DAGBuilder("lookup").add_task("a", noop), "missing")
+        self.assertEqual(cm.exception.code, 1)
+        self.assertEqual(err.getvalue(), "❌ Unknown task: missing\n")
+
+    def branch_dag(self, fn=noop):
+        return DAGBuilder("branch").add_branch("chk", lambda: "lo", {
+            "hi": [Task(name="p_hi", fn=fn)],
+            "lo": [Task(name="p_lo", fn=fn)],
+        })
+
+    def test_start_line_is_written_before_task_output(self):
+        out = run_task(DAGBuilder("order").add_task("a", lambda: print("working")), "a")
+        self.assertEqual(out, "🚀 Starting task: a\nworking\n")
+
+    def test_branch_task_prints_selected_branch(self):
+        out = run_task(self.branch_dag(), "chk")
+        self.assertEqual(out, "🚀 Starting task: chk\n"
+                              "🔀 Branch selected: lo\n"
+                              "NAUTIKUS_BRANCH_RESULT=lo\n")
+
+    def test_unselected_branch_task_is_skipped(self):
+        fn = mock.Mock()
+        out = run_task(self.branch_dag(fn), "p_lo", NAUTIKUS_SELECTED_BRANCH="hi")
+        fn.assert_not_called()
+        self.assertEqual(out, "🚀 Starting task: p_lo\n"
+                              "⏭️  Skipping task p_lo (branch lo not selected, selected: hi)\n")
+
+    def test_selected_branch_task_runs(self):
+        fn = mock.Mock()
+        run_task(self.branch_dag(fn), "p_lo", NAUTIKUS_SELECTED_BRANCH="lo")
+        fn.assert_called_once_with()
+
+    def test_failure_hook_is_removed_after_success(self):
+        hook = sys.excepthook
+        run_task(DAGBuilder("hook").add_task("a", noop), "a")
+        self.assertIs(sys.excepthook, hook)
+
+    def test_failing_task_reports_and_exits_with_1(self):
+        script = textwrap.dedent(f"""\
+            import sys
+            sys.path.append({ROOT!r})
+            from pkg.sdk.python import DAGBuilder
+
+            def boom():
+                raise RuntimeError("disk full")
+
+            DAGBuilder("failing").add_task("boom", boom).serve()
+        """)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "failing_dag.py")
+            with open(path, "w") as f:
+                f.write(script)
+            result = subprocess.run([sys.executable, path], capture_output=True, text=True,
+                                    env={**os.environ, "NAUTIKUS_TASK_NAME": "boom"})
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(result.stdout, "🚀 Starting task: boom\n❌ Task failed: disk full\n")
+        self.assertTrue(result.stderr.startswith("Traceback (most recent call last):"))
+        self.assertTrue(result.stderr.endswith("RuntimeError: disk full\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()